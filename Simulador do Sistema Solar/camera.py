@@ -28,20 +28,56 @@ class Camera:
 
         # Pan/zoom via touch
         self.touches: dict[int, pygame.Vector2] = {}  # finger_id -> pos tela
-        self.last_pinch_dist: float | None = None
+        self.last_pinch_dist_sq: float | None = None  # distância ao quadrado
+
+        # Zoom via scroll: soma os "cliques" da roda no frame e aplica uma vez
+        self._wheel_accum = 0
+        # Zoom via pinch pendente no frame: (fator acumulado, centro do pinch)
+        self._pending_pinch: tuple[float, pygame.Vector2] | None = None
+
+        # tamanho da tela (w, h); None = ainda não consultado
+        self._size_cache: tuple[int, int] | None = None
 
         # flag pública usada no main para saber se o jogador está "arrastando"
         self.is_dragging = False
 
+        # tabelas de despacho: tipo de evento -> handler, botão -> handler
+        self._ev_dispatch = {
+            pygame.FINGERDOWN: self._handle_finger_down,
+            pygame.FINGERUP: self._handle_finger_up,
+            pygame.FINGERMOTION: self._handle_finger_motion,
+            pygame.MOUSEBUTTONDOWN: self._on_mbdown,
+            pygame.MOUSEBUTTONUP: self._on_mbup,
+            pygame.MOUSEMOTION: self._on_mouse_motion,
+            pygame.MOUSEWHEEL: self._on_mouse_wheel,
+            pygame.VIDEORESIZE: self._on_resize,
+        }
+        self._btn_dispatch = {
+            3: self._start_pan,
+        }
+
     # -----------------------
     # Utilitários internos
     # -----------------------
 
     def _screen_size(self):
-        surf = pygame.display.get_surface()
-        if surf is None:
-            return 1, 1
-        return surf.get_size()
+        # tamanho da tela em cache; só muda em VIDEORESIZE
+        if self._size_cache is None:
+            surf = pygame.display.get_surface()
+            if surf is None:
+                return 1, 1
+            self._size_cache = surf.get_size()
+        return self._size_cache
+
+    def _on_resize(self, event):
+        self._size_cache = (event.w, event.h)
+
+    @staticmethod
+    def _dist_sq(p1, p2):
+        """Distância ao quadrado entre dois pontos (evita a raiz quadrada)."""
+        dx = p1.x - p2.x
+        dy = p1.y - p2.y
+        return dx * dx + dy * dy
 
     def _apply_zoom_around_point(self, new_zoom: float, screen_point):
         """
@@ -89,7 +125,7 @@ class Camera:
         elif len(self.touches) == 2:
             # 2 dedos: inicia pinch
             fingers = list(self.touches.values())
-            self.last_pinch_dist = fingers[0].distance_to(fingers[1])
+            self.last_pinch_dist_sq = self._dist_sq(fingers[0], fingers[1])
 
     def _handle_finger_up(self, event):
         if event.finger_id in self.touches:
@@ -98,13 +134,20 @@ class Camera:
         if len(self.touches) == 0:
             self._dragging = False
             self.is_dragging = False
-            self.last_pinch_dist = None
+            self.last_pinch_dist_sq = None
         elif len(self.touches) == 1:
             # Volta para pan de 1 dedo
             # atualiza referência de posição
             remaining_pos = list(self.touches.values())[0]
             self._last_mouse_pos = remaining_pos
-            self.last_pinch_dist = None
+            self.last_pinch_dist_sq = None
+
+    def _queue_pinch(self, factor, pinch_center):
+        """Acumula o fator de zoom do pinch e guarda o centro mais recente."""
+        if self._pending_pinch is None:
+            self._pending_pinch = (factor, pinch_center)
+        else:
+            self._pending_pinch = (self._pending_pinch[0] * factor, pinch_center)
 
     def _handle_finger_motion(self, event):
         screen_w, screen_h = self._screen_size()
@@ -125,77 +168,91 @@ class Camera:
             # Pinch-zoom com 2 dedos
             fingers = list(self.touches.values())
             p1, p2 = fingers[0], fingers[1]
-            new_dist = p1.distance_to(p2)
+            new_dist_sq = self._dist_sq(p1, p2)
 
-            if self.last_pinch_dist is not None and self.last_pinch_dist > 0:
+            if self.last_pinch_dist_sq is not None and self.last_pinch_dist_sq > 0:
                 # se distância aumentou -> zoom "para dentro" (aproxima)
                 # se diminuiu -> zoom "para fora" (afasta)
-                dist_ratio = new_dist / self.last_pinch_dist
+                # razão entre distâncias ao quadrado: limites 1.01² e 0.99²
+                dist_ratio_sq = new_dist_sq / self.last_pinch_dist_sq
 
                 # pequeno amortecimento pra não ficar nervoso
-                if dist_ratio > 1.01:
+                # o zoom só é aplicado em apply_pending(), uma vez por frame
+                if dist_ratio_sq > 1.0201:
                     # "aproxima" (coerente com o que você já tinha no scroll)
-                    new_zoom = self.zoom * 0.9
-                    pinch_center = (p1 + p2) / 2
-                    self._apply_zoom_around_point(new_zoom, pinch_center)
+                    self._queue_pinch(0.9, (p1 + p2) / 2)
 
-                elif dist_ratio < 0.99:
+                elif dist_ratio_sq < 0.9801:
                     # "afasta"
-                    new_zoom = self.zoom * 1.1
-                    pinch_center = (p1 + p2) / 2
-                    self._apply_zoom_around_point(new_zoom, pinch_center)
+                    self._queue_pinch(1.1, (p1 + p2) / 2)
 
-            self.last_pinch_dist = new_dist
+            self.last_pinch_dist_sq = new_dist_sq
 
     # -----------------------
-    # Eventos gerais (mouse + touch)
+    # Eventos de mouse
     # -----------------------
 
-    def handle_event(self, event):
-        """
-        Processa eventos de mouse + touch.
-        """
+    def _start_pan(self, event):
+        # botão direito inicia pan
+        if self.pan_enabled:
+            self._dragging = True
+            self.is_dragging = True
+            self._last_mouse_pos = pygame.Vector2(event.pos)
 
-        # --- TOUCH / FINGER ---
-        if event.type == pygame.FINGERDOWN:
-            self._handle_finger_down(event)
+    def _on_mbdown(self, event):
+        # Se há toques ativos, ignoramos o mouse para não misturar
+        if self.touches:
             return
+        fn = self._btn_dispatch.get(event.button)
+        if fn:
+            fn(event)
 
-        if event.type == pygame.FINGERUP:
-            self._handle_finger_up(event)
+    def _on_mbup(self, event):
+        if self.touches:
             return
+        if event.button == 3:
+            self._dragging = False
+            self.is_dragging = False
 
-        if event.type == pygame.FINGERMOTION:
-            self._handle_finger_motion(event)
+    def _on_mouse_motion(self, event):
+        if self.touches:
             return
+        if self._dragging and self.pan_enabled:
+            rel = pygame.Vector2(event.rel)
+            self._pan_with_delta(rel)
 
-        # Se há toques ativos, ignoramos pan via mouse para não misturar
+    def _on_mouse_wheel(self, event):
+        # só acumula; o zoom é aplicado uma vez por frame em apply_pending()
         if self.touches:
             return
+        self._wheel_accum += event.y
+
+    # -----------------------
+    # Eventos gerais (mouse + touch)
+    # -----------------------
 
-        # --- MOUSE ---
-        if event.type == pygame.MOUSEBUTTONDOWN:
-            if event.button == 3 and self.pan_enabled:
-                # botão direito inicia pan
-                self._dragging = True
-                self.is_dragging = True
-                self._last_mouse_pos = pygame.Vector2(event.pos)
-
-            # scroll para zoom
-            elif event.button == 4:  # rolar para cima
-                new_zoom = self.zoom * 0.9
-                self._apply_zoom_around_point(new_zoom, event.pos)
-
-            elif event.button == 5:  # rolar para baixo
-                new_zoom = self.zoom * 1.1
-                self._apply_zoom_around_point(new_zoom, event.pos)
-
-        elif event.type == pygame.MOUSEBUTTONUP:
-            if event.button == 3:
-                self._dragging = False
-                self.is_dragging = False
-
-        elif event.type == pygame.MOUSEMOTION:
-            if self._dragging and self.pan_enabled:
-                rel = pygame.Vector2(event.rel)
-                self._pan_with_delta(rel)
+    def handle_event(self, event):
+        """
+        Processa eventos de mouse + touch.
+        """
+        fn = self._ev_dispatch.get(event.type)
+        if fn:
+            fn(event)
+
+    def apply_pending(self):
+        """
+        Aplica de uma vez o zoom acumulado pelos eventos do frame.
+        Deve ser chamada uma vez por frame, depois de processar os eventos.
+        """
+        n = self._wheel_accum
+        if n != 0:
+            # rolar para cima (y > 0): zoom * 0.9 por clique
+            # rolar para baixo (y < 0): zoom * 1.1 por clique
+            new_zoom = self.zoom * (0.9 ** n if n > 0 else 1.1 ** -n)
+            self._wheel_accum = 0
+            self._apply_zoom_around_point(new_zoom, pygame.mouse.get_pos())
+
+        if self._pending_pinch is not None:
+            factor, pinch_center = self._pending_pinch
+            self._pending_pinch = None
+            self._apply_zoom_around_point(self.zoom * factor, pinch_center)
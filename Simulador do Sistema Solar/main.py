@@ -1,10 +1,11 @@
 # main.py
 import json
+import math
 import os
 import pygame
 import asyncio
 
-from planet import Planet
+from planet import Planet, render_text
 from camera import Camera
 
 # Em ambiente web (pygbag), caminhos relativos são mais seguros
@@ -21,6 +22,22 @@ RADIUS_MIN = 1.0
 RADIUS_MAX = 120.0
 TIME_SCALE = 30000.0
 
+# Únicos tipos de evento tratados; os demais (janela, áudio, joystick...)
+# nem entram na fila
+HANDLED_EVENTS = [
+    pygame.QUIT,
+    pygame.MOUSEBUTTONDOWN,
+    pygame.MOUSEBUTTONUP,
+    pygame.MOUSEMOTION,
+    pygame.MOUSEWHEEL,
+    pygame.FINGERDOWN,
+    pygame.FINGERUP,
+    pygame.FINGERMOTION,
+    pygame.VIDEORESIZE,
+    pygame.WINDOWEXPOSED,
+    pygame.WINDOWRESTORED,
+]
+
 
 def load_solar_system():
     """Carrega os planetas do JSON e cria os objetos Planet."""
@@ -60,6 +77,7 @@ def load_solar_system():
         )
         planet.time_scale = TIME_SCALE
         planet.set_visual_scale(RADIUS_MIN, RADIUS_MAX, RADIUS_SCALE, AU_TO_PX)
+        planet.focus_zoom = get_focus_zoom_for_planet(planet)
 
         # posição inicial aproximada
         if planet.a_au <= 0:
@@ -81,12 +99,110 @@ def load_solar_system():
             else:
                 print(f"[AVISO] parent_name '{p.parent_name}' não encontrado para '{p.planet_name}'")
 
+    # Desfaz ciclos de pais (ex.: parent_name igual ao próprio nome): corta só
+    # a ligação que fecha o ciclo, e esse corpo passa a orbitar a origem
+    for p in bodies:
+        visited = {id(p)}
+        node = p
+        while node.parent is not None:
+            if id(node.parent) in visited:
+                print(
+                    f"[AVISO] ciclo em parent_name: '{node.planet_name}' → "
+                    f"'{node.parent.planet_name}', ignorando o pai"
+                )
+                node.parent = None
+                break
+            node = node.parent
+            visited.add(id(node))
+
     # Atualizar pais antes de filhos (Sol/Terra antes da Lua)
     bodies.sort(key=lambda p: 0 if getattr(p, "parent", None) is None else 1)
 
     return bodies
 
 
+def build_orbit_state(bodies):
+    """
+    Monta o estado das órbitas em listas paralelas (SoA): ângulo, velocidade
+    angular, raio da órbita em px e índice do pai (-1 = orbita a origem).
+    Os corpos ficam ordenados de forma que o pai venha antes dos filhos.
+    """
+    def depth(p):
+        d = 0
+        while p.parent is not None:
+            p = p.parent
+            d += 1
+        return d
+
+    order = sorted(bodies, key=depth)
+    index = {id(p): i for i, p in enumerate(order)}
+
+    angle, omega, r_px, parent_idx = [], [], [], []
+    for p in order:
+        angle.append(p.angle)
+        if p.period_days > 0.0 and p.a_au > 0.0:
+            T_real = p.period_days * 86400.0
+            omega.append((2.0 * math.pi * p.time_scale) / T_real)
+            r_px.append(p.orbit_r_px)
+        else:
+            # corpo parado na origem ou em cima do pai
+            omega.append(0.0)
+            r_px.append(0.0)
+        parent_idx.append(-1 if p.parent is None else index[id(p.parent)])
+
+    n = len(order)
+    return {
+        "bodies": order,
+        "angle": angle,
+        "omega": omega,
+        "r_px": r_px,
+        "parent_idx": parent_idx,
+        "x": [0.0] * n,
+        "y": [0.0] * n,
+    }
+
+
+def update_orbits(orbits, delta):
+    """
+    Atualiza a posição de todos os corpos de uma vez a partir do estado SoA.
+    Se não tiver pai -> orbita (0,0).
+    Se tiver pai     -> orbita em volta do pai (ex.: Lua em volta da Terra).
+    """
+    two_pi = 2.0 * math.pi
+    cos, sin = math.cos, math.sin
+    bodies = orbits["bodies"]
+    angle = orbits["angle"]
+    omega = orbits["omega"]
+    r_px = orbits["r_px"]
+    parent_idx = orbits["parent_idx"]
+    xs = orbits["x"]
+    ys = orbits["y"]
+
+    for i in range(len(bodies)):
+        r = r_px[i]
+        if r:
+            a = (angle[i] + omega[i] * delta) % two_pi
+            angle[i] = a
+            x = cos(a) * r
+            y = sin(a) * r
+        else:
+            # corpo parado (Sol): sem trigonometria
+            a = angle[i]
+            x = y = 0.0
+
+        j = parent_idx[i]
+        if j >= 0:
+            x += xs[j]
+            y += ys[j]
+
+        xs[i] = x
+        ys[i] = y
+
+        p = bodies[i]
+        p.angle = a
+        p.position.update(x, y)
+
+
 def reorder_bodies_for_buttons(bodies):
     """
     Garante que a Lua venha imediatamente depois da Terra nos botões.
@@ -125,8 +241,9 @@ def get_focus_zoom_for_planet(planet):
     """
     Define o nível de zoom automático quando a câmera foca em um planeta
     a partir dos botões da barra inferior.
+    Chamada uma vez no carregamento; o resultado fica em planet.focus_zoom.
     """
-    name = planet.planet_name.lower()
+    name = planet._name_lower
 
     # Sol
     if "sol" in name or "sun" in name:
@@ -169,23 +286,8 @@ def wrap_text(text, font, max_width):
     return lines
 
 
-def draw_planet_info_box(screen, planet, camera, font_title, font_text):
-    """Desenha a caixinha de informação ao lado do planeta selecionado."""
-    if planet is None or not planet.fact:
-        return
-
-    screen_w, screen_h = screen.get_size()
-    center = pygame.Vector2(screen_w / 2, screen_h / 2)
-
-    planet_screen_pos = (planet.position - camera.position) * camera.zoom + center
-
-    title = planet.planet_name
-    fact_text = planet.fact
-
-    max_box_width = 320
-    padding = 10
-    OFFSET_X = 60  # caixinha um pouco mais à direita
-
+def build_info_box_surface(title, fact_text, font_title, font_text, max_box_width, padding):
+    """Renderiza título + texto quebrado em linhas numa superfície semi-transparente."""
     title_surf = font_title.render(title, True, (255, 255, 255))
     title_w, title_h = title_surf.get_size()
 
@@ -197,21 +299,7 @@ def draw_planet_info_box(screen, planet, camera, font_title, font_text):
     box_width = max(title_w, max((s.get_width() for s in line_surfs), default=0)) + 2 * padding
     box_height = content_height + 2 * padding
 
-    box_x = planet_screen_pos.x + OFFSET_X
-    box_y = planet_screen_pos.y - box_height / 2
-
-    # Mantém dentro da tela
-    if box_x + box_width > screen_w - 10:
-        box_x = planet_screen_pos.x - box_width - OFFSET_X
-    if box_x < 10:
-        box_x = 10
-    if box_y < 10:
-        box_y = 10
-    if box_y + box_height > screen_h - 10:
-        box_y = screen_h - box_height - 10
-
-    box_rect = pygame.Rect(int(box_x), int(box_y), int(box_width), int(box_height))
-    box_surface = pygame.Surface((box_rect.width, box_rect.height), pygame.SRCALPHA)
+    box_surface = pygame.Surface((int(box_width), int(box_height)), pygame.SRCALPHA)
     box_surface.fill((10, 10, 40, 200))  # fundo semi-transparente
 
     pygame.draw.rect(box_surface, (255, 255, 255), box_surface.get_rect(), width=1)
@@ -224,7 +312,53 @@ def draw_planet_info_box(screen, planet, camera, font_title, font_text):
         box_surface.blit(s, (padding, y))
         y += line_height
 
-    screen.blit(box_surface, box_rect.topleft)
+    return box_surface
+
+
+def draw_planet_info_box(
+    screen, planet, font_title, font_text,
+    cam_px, cam_py, zoom, screen_w, screen_h, cx, cy
+):
+    """
+    Desenha a caixinha de informação ao lado do planeta selecionado.
+    Retorna o retângulo ocupado na tela (ou None se não desenhou).
+    """
+    if planet is None or not planet.fact:
+        return None
+
+    planet_sx = (planet.position.x - cam_px) * zoom + cx
+    planet_sy = (planet.position.y - cam_py) * zoom + cy
+
+    max_box_width = 320
+    padding = 10
+    OFFSET_X = 60  # caixinha um pouco mais à direita
+
+    # conteúdo da caixinha (texto quebrado + fundo) só muda se mudar a
+    # largura ou as fontes: monta uma vez e guarda no planeta
+    key = (max_box_width, id(font_title), id(font_text))
+    box_surface = planet._info_box_cache.get(key)
+    if box_surface is None:
+        box_surface = build_info_box_surface(
+            planet.planet_name, planet.fact, font_title, font_text, max_box_width, padding
+        )
+        planet._info_box_cache[key] = box_surface
+
+    box_width, box_height = box_surface.get_size()
+
+    box_x = planet_sx + OFFSET_X
+    box_y = planet_sy - box_height / 2
+
+    # Mantém dentro da tela
+    if box_x + box_width > screen_w - 10:
+        box_x = planet_sx - box_width - OFFSET_X
+    if box_x < 10:
+        box_x = 10
+    if box_y < 10:
+        box_y = 10
+    if box_y + box_height > screen_h - 10:
+        box_y = screen_h - box_height - 10
+
+    return screen.blit(box_surface, (int(box_x), int(box_y)))
 
 
 def build_planet_buttons(bodies, screen_width, screen_height, font):
@@ -251,6 +385,30 @@ def build_planet_buttons(bodies, screen_width, screen_height, font):
     return buttons
 
 
+def find_button_at(buttons, pos):
+    """
+    Acha o botão sob pos sem percorrer a lista: os botões formam uma fileira
+    de largura e espaçamento uniformes, então o índice sai direto do x.
+    """
+    if not buttons:
+        return None
+
+    mx, my = pos
+    first = buttons[0]["rect"]
+    if not (first.top <= my < first.bottom):
+        return None
+
+    if len(buttons) > 1:
+        stride = buttons[1]["rect"].x - first.x
+    else:
+        stride = first.width
+
+    i = (mx - first.x) // stride
+    if 0 <= i < len(buttons) and buttons[i]["rect"].collidepoint(pos):
+        return buttons[i]
+    return None
+
+
 def draw_planet_buttons(screen, buttons, font, selected_planet):
     """Desenha a barra de botões com o nome de cada planeta."""
     for btn in buttons:
@@ -265,17 +423,35 @@ def draw_planet_buttons(screen, buttons, font, selected_planet):
         pygame.draw.rect(screen, bg_color, rect, border_radius=6)
         pygame.draw.rect(screen, border_color, rect, width=1, border_radius=6)
 
-        label_surf = font.render(planet.planet_name, True, text_color)
+        label_surf = render_text(font, planet.planet_name, text_color)
         label_rect = label_surf.get_rect(center=rect.center)
         screen.blit(label_surf, label_rect)
 
 
-def draw_tiled_background(screen, camera, bg_image):
+def build_tiled_background(bg_image, screen_w, screen_h):
+    """
+    Pré-renderiza o background repetido numa superfície um tile maior que
+    a tela, para que cada frame precise de um único blit.
+    """
+    if bg_image is None:
+        return None
+
+    bg_w, bg_h = bg_image.get_size()
+    bg_tiled = pygame.Surface((screen_w + bg_w, screen_h + bg_h)).convert()
+
+    for x in range(0, screen_w + bg_w, bg_w):
+        for y in range(0, screen_h + bg_h, bg_h):
+            bg_tiled.blit(bg_image, (x, y))
+
+    return bg_tiled
+
+
+def draw_tiled_background(screen, camera, bg_image, bg_tiled):
     """
     Desenha o background repetido (tiling), acompanhando o pan.
     O fundo não é escalado pelo zoom (parece um céu muito distante).
     """
-    if bg_image is None:
+    if bg_image is None or bg_tiled is None:
         screen.fill((5, 5, 20))
         return
 
@@ -287,13 +463,14 @@ def draw_tiled_background(screen, camera, bg_image):
     offset_x = int(-camera.position.x * PARALLAX) % bg_w
     offset_y = int(-camera.position.y * PARALLAX) % bg_h
 
-    for x in range(-bg_w, screen_w + bg_w, bg_w):
-        for y in range(-bg_h, screen_h + bg_h, bg_h):
-            screen.blit(bg_image, (x + offset_x, y + offset_y))
+    area = pygame.Rect(bg_w - offset_x, bg_h - offset_y, screen_w, screen_h)
+    screen.blit(bg_tiled, (0, 0), area)
 
 
 async def main():
     pygame.init()
+    pygame.event.set_blocked(None)
+    pygame.event.set_allowed(HANDLED_EVENTS)
     pygame.display.set_caption("Simulador do Sistema Solar (escala aproximada)")
 
     screen_width, screen_height = 1280, 720
@@ -317,6 +494,8 @@ async def main():
         print(f"[Main] ERRO ao carregar background ({bg_path}): {e}")
         bg_image = None
 
+    bg_tiled = build_tiled_background(bg_image, screen_width, screen_height)
+
     # max_zoom maior para chegar bem perto, min_zoom bem pequeno p/ ver o sistema inteiro
     cam = Camera(min_zoom=0.0015, max_zoom=10.0, zoom_sensitivity=1.0)
     cam.position.update(0.0, 0.0)
@@ -324,6 +503,7 @@ async def main():
 
     bodies = load_solar_system()
     bodies = reorder_bodies_for_buttons(bodies)
+    orbits = build_orbit_state(bodies)
 
     selected_planet = None
     follow_planet = None
@@ -339,14 +519,29 @@ async def main():
         f"Clique no planeta ou nos botões abaixo"
     )
 
+    # dirty rects: com a câmera parada só os planetas mudam na tela, então
+    # basta enviar ao display as áreas do frame anterior + as do atual
+    prev_dirty = []
+    prev_view = None
+    prev_selected = None
+    # janela exposta/restaurada: o conteúdo pode ter sido perdido
+    force_flip = False
+
     running = True
     while running:
         dt = clock.tick(60) / 1000.0
 
-        for event in pygame.event.get():
+        # tamanho/centro da tela calculados uma vez por frame
+        screen_w, screen_h = screen.get_size()
+        cx, cy = screen_w / 2, screen_h / 2
+
+        for event in pygame.event.get(HANDLED_EVENTS):
             if event.type == pygame.QUIT:
                 running = False
 
+            if event.type in (pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED):
+                force_flip = True
+
             # camera (mouse + touch)
             cam.handle_event(event)
 
@@ -354,11 +549,7 @@ async def main():
                 mouse_pos = event.pos
 
                 # 1) Verifica se clicou em algum botão
-                clicked_button = None
-                for btn in buttons:
-                    if btn["rect"].collidepoint(mouse_pos):
-                        clicked_button = btn
-                        break
+                clicked_button = find_button_at(buttons, mouse_pos)
 
                 if clicked_button is not None:
                     selected_planet = clicked_button["planet"]
@@ -366,7 +557,7 @@ async def main():
                     camera_locked_to_planet = True
 
                     # Zoom específico para cada planeta
-                    desired_zoom = get_focus_zoom_for_planet(selected_planet)
+                    desired_zoom = selected_planet.focus_zoom
                     cam.zoom = max(cam.min_zoom, min(cam.max_zoom, desired_zoom))
 
                     # Centraliza na posição atual do planeta
@@ -375,8 +566,9 @@ async def main():
                 else:
                     # 2) Clique direto no planeta (centraliza mas NÃO trava)
                     clicked_planet = None
+                    cam_px, cam_py, zoom = cam.position.x, cam.position.y, cam.zoom
                     for p in bodies:
-                        if p.is_clicked(mouse_pos, cam):
+                        if p.is_clicked(mouse_pos, cam_px, cam_py, zoom, cx, cy):
                             clicked_planet = p
                             break
                     selected_planet = clicked_planet
@@ -385,21 +577,26 @@ async def main():
                         camera_locked_to_planet = False
                         cam.position = clicked_planet.position.copy()
 
+        # zoom acumulado no frame (scroll/pinch) aplicado uma vez só
+        cam.apply_pending()
+
         # Se estava travada em planeta e o jogador começou a dar pan, destrava
         if camera_locked_to_planet and cam.is_dragging:
             camera_locked_to_planet = False
             follow_planet = None
 
         # Atualiza planetas
-        for p in bodies:
-            p.update_position(dt)
+        update_orbits(orbits, dt)
 
         # Se está travada em planeta, acompanha ele
         if camera_locked_to_planet and follow_planet is not None:
-            cam.position = follow_planet.position.copy()
+            cam.position.x = follow_planet.position.x
+            cam.position.y = follow_planet.position.y
 
-        # Desenho
-        draw_tiled_background(screen, cam, bg_image)
+        # Desenho (câmera lida uma vez por frame, como escalares)
+        cam_px, cam_py, zoom = cam.position.x, cam.position.y, cam.zoom
+        draw_tiled_background(screen, cam, bg_image, bg_tiled)
+        dirty = []
 
         # Se não carregou nenhum planeta, mostra mensagem em vez de tela preta
         if len(bodies) == 0:
@@ -407,24 +604,46 @@ async def main():
             msg2 = "Verifique se 'planets.json' está no mesmo diretório que main.py"
             msg3 = "e se ele foi incluído no build do pygbag."
 
-            text1 = info_font.render(msg1, True, (255, 200, 200))
-            text2 = text_font.render(msg2, True, (255, 255, 255))
-            text3 = text_font.render(msg3, True, (255, 255, 255))
+            text1 = render_text(info_font, msg1, (255, 200, 200))
+            text2 = render_text(text_font, msg2, (255, 255, 255))
+            text3 = render_text(text_font, msg3, (255, 255, 255))
 
             screen.blit(text1, (40, 80))
             screen.blit(text2, (40, 110))
             screen.blit(text3, (40, 140))
         else:
             for p in bodies:
-                p.draw(screen, cam, font)
-
-            draw_planet_info_box(screen, selected_planet, cam, title_font, text_font)
+                rect = p.draw(screen, font, cam_px, cam_py, zoom, screen_w, screen_h, cx, cy)
+                if rect is not None:
+                    dirty.append(rect)
+
+            rect = draw_planet_info_box(
+                screen, selected_planet, title_font, text_font,
+                cam_px, cam_py, zoom, screen_w, screen_h, cx, cy
+            )
+            if rect is not None:
+                dirty.append(rect)
             draw_planet_buttons(screen, buttons, button_font, selected_planet)
 
-        info_surface = info_font.render(info_text, True, (255, 255, 255))
+        info_surface = render_text(info_font, info_text, (255, 255, 255))
         screen.blit(info_surface, (16, 16))
 
-        pygame.display.flip()
+        # câmera mexeu, mudou a seleção/botões ou a janela foi exposta:
+        # envia a tela inteira
+        view = (cam_px, cam_py, zoom, screen_w, screen_h)
+        if (
+            force_flip
+            or view != prev_view
+            or selected_planet is not prev_selected
+            or not bodies
+        ):
+            pygame.display.flip()
+        else:
+            pygame.display.update(prev_dirty + dirty)
+        prev_dirty = dirty
+        prev_view = view
+        prev_selected = selected_planet
+        force_flip = False
 
         await asyncio.sleep(0)
 
@@ -1,6 +1,7 @@
 # planet.py
-import math
+import functools
 import os
+import string
 import unicodedata
 import pygame
 
@@ -9,23 +10,58 @@ def clamp(value, vmin, vmax):
     return max(vmin, min(vmax, value))
 
 
+@functools.lru_cache(maxsize=64)
 def hex_to_rgb(hex_color: str):
-    """Converte cor #RRGGBB para (R, G, B) em 0-255."""
+    """Converte cor #RRGGBB para (R, G, B) em 0-255 (com cache: cores se repetem)."""
     hex_color = hex_color.strip()
     if hex_color.startswith("#"):
         hex_color = hex_color[1:]
-    if len(hex_color) != 6:
+    # só dígitos hex: int(..., 16) aceitaria "0x", sinal e "_"
+    if len(hex_color) != 6 or not all(c in string.hexdigits for c in hex_color):
         return (255, 255, 255)
-    r = int(hex_color[0:2], 16)
-    g = int(hex_color[2:4], 16)
-    b = int(hex_color[4:6], 16)
-    return (r, g, b)
+    v = int(hex_color, 16)
+    return ((v >> 16) & 0xFF, (v >> 8) & 0xFF, v & 0xFF)
+
+
+@functools.lru_cache(maxsize=512)
+def render_text(font, text, color):
+    """
+    font.render com cache: nomes e textos fixos são renderizados uma vez só.
+    A superfície devolvida é compartilhada, então não deve ser alterada.
+    """
+    return font.render(text, True, color)
+
+
+def circle_crosses_rect(cx, cy, radius, w, h):
+    """
+    Diz se o contorno de um círculo passa pelo retângulo (0, 0, w, h).
+    Falso se o círculo está todo fora da tela ou se a tela está toda
+    dentro do círculo (anel maior que a tela).
+    """
+    # ponto do retângulo mais perto do centro
+    nx = min(max(cx, 0), w) - cx
+    ny = min(max(cy, 0), h) - cy
+    # canto do retângulo mais longe do centro
+    fx = max(abs(cx), abs(w - cx))
+    fy = max(abs(cy), abs(h - cy))
+
+    r_sq = radius * radius
+    return nx * nx + ny * ny <= r_sq <= fx * fx + fy * fy
+
+
+# margem extra ao redor do planeta para não cortar o nome (label) na borda
+LABEL_MARGIN = 40
 
 
 # pasta das imagens (mesmo nível que main.py / planet.py)
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 IMG_DIR = os.path.join(BASE_DIR, "img")
 
+# imagens já carregadas (caminho -> Surface), compartilhadas entre planetas
+_IMG_CACHE: dict[str, pygame.Surface] = {}
+# nomes de arquivo candidatos já calculados (nome do planeta -> lista)
+_NAME_CANDIDATES: dict[str, list[str]] = {}
+
 
 def _normalize_name_for_file(name: str) -> list[str]:
     """
@@ -62,17 +98,28 @@ class Planet:
         parent_name: str | None = None,
     ):
         self.planet_name = name
+        self._name_lower = name.lower()
         self.radius_km = float(radius_km)
         self.a_au = float(a_au)
         self.period_days = float(period_days)
         self.color = hex_to_rgb(color_hex)
         self.draw_orbit = draw_orbit
         self.fact = fact or ""
+        # caixinha de informação inteira já renderizada (título + texto + fundo):
+        # (largura máx., fontes) -> Surface
+        self._info_box_cache: dict[tuple, pygame.Surface] = {}
+
+        # fator de correção visual do sprite (Lua ~40% do raio da Terra)
+        self._sprite_scale_factor = 0.4 if self._name_lower in ("lua", "moon") else 1.0
+
+        # zoom usado ao focar o planeta pelos botões (definido no main)
+        self.focus_zoom: float | None = None
 
         # órbita / escala
         self.angle = 0.0
         self.radius_px = 5.0
         self.au_to_px = 1000.0
+        self.orbit_r_px = self.a_au * self.au_to_px  # raio da órbita em px
         self.time_scale = 20000.0
         self.position = pygame.Vector2(0.0, 0.0)
 
@@ -84,16 +131,29 @@ class Planet:
         self.image: pygame.Surface | None = None
         self._load_image_if_available()
 
+        # cache do sprite redimensionado (só refaz o smoothscale se o diâmetro mudar)
+        self._cached_diameter = -1
+        self._cached_sprite: pygame.Surface | None = None
+
     # ---------- imagem ----------
 
     def _load_image_if_available(self):
         """Tenta carregar uma imagem PNG na pasta img/ com o nome do planeta."""
-        candidates = _normalize_name_for_file(self.planet_name)
+        candidates = _NAME_CANDIDATES.get(self.planet_name)
+        if candidates is None:
+            candidates = _normalize_name_for_file(self.planet_name)
+            _NAME_CANDIDATES[self.planet_name] = candidates
+
         for filename in candidates:
             path = os.path.join(IMG_DIR, filename)
+            img = _IMG_CACHE.get(path)
+            if img is not None:
+                self.image = img
+                return
             if os.path.exists(path):
                 try:
                     img = pygame.image.load(path).convert_alpha()
+                    _IMG_CACHE[path] = img
                     self.image = img
                     print(f"[Planet] Usando imagem para {self.planet_name}: {filename}")
                     return
@@ -117,114 +177,101 @@ class Planet:
         já ficam fisicamente corretas. Ajustamos só min/max.
         """
         self.au_to_px = au_to_px
+        self.orbit_r_px = self.a_au * au_to_px
         # escala linear: km * fator → px (proporções reais entre raios)
         raw_px = self.radius_km * radius_scale
         self.radius_px = clamp(raw_px, radius_px_min, radius_px_max)
 
-    def update_position(self, delta: float):
-        """
-        Se não tiver pai -> orbita (0,0).
-        Se tiver pai     -> orbita em volta do pai (ex.: Lua em volta da Terra).
-        """
-        if self.period_days <= 0.0 or self.a_au <= 0.0:
-            if self.parent is None:
-                self.position.update(0.0, 0.0)
-            else:
-                self.position = self.parent.position.copy()
-            return
-
-        T_real = self.period_days * 86400.0
-        if T_real == 0:
-            return
-
-        omega = (2.0 * math.pi * self.time_scale) / T_real
-        self.angle = (self.angle + omega * delta) % (2.0 * math.pi)
-
-        r = self.a_au * self.au_to_px
-        rel_x = math.cos(self.angle) * r
-        rel_y = math.sin(self.angle) * r
-
-        if self.parent is None:
-            self.position.x = rel_x
-            self.position.y = rel_y
-        else:
-            self.position.x = self.parent.position.x + rel_x
-            self.position.y = self.parent.position.y + rel_y
-
     # ---------- desenho ----------
 
-    def draw(self, surface, camera, font):
-        screen_w, screen_h = surface.get_size()
-        center = pygame.Vector2(screen_w / 2, screen_h / 2)
+    def draw(self, surface, font, cam_px, cam_py, zoom, screen_w, screen_h, cx, cy):
+        """
+        A câmera chega como escalares (cam_px, cam_py, zoom) e screen_w/screen_h
+        e o centro (cx, cy) são calculados uma vez por frame no main, em vez de
+        consultar a superfície para cada planeta. Tudo em floats, sem Vector2.
+
+        Retorna o retângulo da tela que mudou com a câmera parada (planeta,
+        nome e, para satélites, a órbita que anda junto com o pai), ou None.
+        """
+        dirty = None
 
-        screen_pos = (self.position - camera.position) * camera.zoom + center
-        radius_on_screen = max(1, int(self.radius_px * camera.zoom))
+        sx = (self.position.x - cam_px) * zoom + cx
+        sy = (self.position.y - cam_py) * zoom + cy
+        radius_on_screen = max(1, int(self.radius_px * zoom))
 
         # centro da órbita (Sol ou pai)
         if self.draw_orbit and self.a_au > 0.0:
             if self.parent is None:
-                orbit_center_world = pygame.Vector2(0.0, 0.0)
+                orbit_cx_world, orbit_cy_world = 0.0, 0.0
             else:
-                orbit_center_world = self.parent.position
-
-            orbit_center_screen = (orbit_center_world - camera.position) * camera.zoom + center
-            orbit_radius = int(self.a_au * self.au_to_px * camera.zoom)
-            if orbit_radius > 0:
-                pygame.draw.circle(
+                orbit_cx_world = self.parent.position.x
+                orbit_cy_world = self.parent.position.y
+
+            orbit_cx = (orbit_cx_world - cam_px) * zoom + cx
+            orbit_cy = (orbit_cy_world - cam_py) * zoom + cy
+            orbit_radius = int(self.orbit_r_px * zoom)
+            if orbit_radius > 0 and circle_crosses_rect(
+                orbit_cx, orbit_cy, orbit_radius, screen_w, screen_h
+            ):
+                orbit_rect = pygame.draw.circle(
                     surface,
                     (255, 255, 255),
-                    (int(orbit_center_screen.x), int(orbit_center_screen.y)),
+                    (int(orbit_cx), int(orbit_cy)),
                     orbit_radius,
                     width=1
                 )
+                # órbitas em volta da origem ficam paradas com a câmera parada
+                if self.parent is not None:
+                    dirty = orbit_rect
+
+        # planeta fora da tela: não desenha sprite nem nome
+        extent = radius_on_screen + LABEL_MARGIN
+        if sx + extent < 0 or sx - extent > screen_w or sy + extent < 0 or sy - extent > screen_h:
+            return dirty
 
         # planeta: usa imagem se tiver, senão bolinha
         if self.image is not None:
-            # fator de correção visual por planeta (Lua bem menor, etc.)
-            scale_factor = 1.0
-            name_lower = self.planet_name.lower()
-
-            # Lua ~40% do raio da Terra
-            if name_lower in ("lua", "moon"):
-                scale_factor = 0.4
-
-            # diâmetro em pixels na tela
-            diameter = max(4, int(self.radius_px * 2 * camera.zoom * scale_factor))
-            sprite = pygame.transform.smoothscale(self.image, (diameter, diameter))
-            rect = sprite.get_rect(center=(screen_pos.x, screen_pos.y))
-            surface.blit(sprite, rect)
+            # diâmetro em pixels na tela (com o fator de correção visual)
+            diameter = max(4, int(self.radius_px * 2 * zoom * self._sprite_scale_factor))
+            if diameter != self._cached_diameter:
+                self._cached_sprite = pygame.transform.smoothscale(self.image, (diameter, diameter))
+                self._cached_diameter = diameter
+            sprite = self._cached_sprite
+            rect = sprite.get_rect(center=(sx, sy))
+            body_rect = surface.blit(sprite, rect)
         else:
             # bolinha colorida
-            pygame.draw.circle(
+            body_rect = pygame.draw.circle(
                 surface,
                 self.color,
-                (int(screen_pos.x), int(screen_pos.y)),
+                (int(sx), int(sy)),
                 radius_on_screen
             )
             pygame.draw.circle(
                 surface,
                 (0, 0, 0),
-                (int(screen_pos.x), int(screen_pos.y)),
+                (int(sx), int(sy)),
                 radius_on_screen,
                 width=1
             )
 
         # nome do planeta
         if font is not None:
-            label_surf = font.render(self.planet_name, True, (255, 255, 255))
+            label_surf = render_text(font, self.planet_name, (255, 255, 255))
             label_rect = label_surf.get_rect()
-            label_rect.center = (screen_pos.x, screen_pos.y - radius_on_screen - 15)
-            surface.blit(label_surf, label_rect)
+            label_rect.center = (sx, sy - radius_on_screen - 15)
+            body_rect = body_rect.union(surface.blit(label_surf, label_rect))
 
-    # ---------- clique ----------
+        return body_rect if dirty is None else dirty.union(body_rect)
 
-    def is_clicked(self, mouse_pos, camera, click_tolerance=1.2):
-        screen_w, screen_h = pygame.display.get_surface().get_size()
-        center = pygame.Vector2(screen_w / 2, screen_h / 2)
+    # ---------- clique ----------
 
-        screen_pos = (self.position - camera.position) * camera.zoom + center
-        radius_on_screen = self.radius_px * camera.zoom * click_tolerance
+    def is_clicked(self, mouse_pos, cam_px, cam_py, zoom, cx, cy, click_tolerance=1.2):
+        sx = (self.position.x - cam_px) * zoom + cx
+        sy = (self.position.y - cam_py) * zoom + cy
+        radius_on_screen = self.radius_px * zoom * click_tolerance
 
-        mouse_vec = pygame.Vector2(mouse_pos)
-        dist = mouse_vec.distance_to(screen_pos)
-        return dist <= radius_on_screen
+        # compara distâncias ao quadrado (evita a raiz quadrada)
+        dx = mouse_pos[0] - sx
+        dy = mouse_pos[1] - sy
+        return dx * dx + dy * dy <= radius_on_screen * radius_on_screen